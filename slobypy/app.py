@@ -30,9 +30,12 @@ class SlApp:
     - None
     """
 
-    # Use list to prevent name conflicts
-    _components: list[dict[str, Any]] = []  # (uri, component, source, metadata, static)
+    # Keyed by the id of the component data (uris may repeat), keeps the registration order and O(1) removal
+    _components: dict[int, dict[str, Any]] = {}  # (uri, component, source, metadata, static)
     only_components: list[type[Component]] = []  # registered components(only)
+    _components_by_source: dict[str, list[dict[str, Any]]] = {}  # resolved source path -> components
+    # component class -> its components, replaced (not mutated) on change, since render threads read it
+    _components_by_cls: dict[type[Component], list[dict[str, Any]]] = {}
     rpc: RPC | None = None
 
     @classmethod
@@ -78,24 +81,47 @@ class SlApp:
         if isinstance(uri, SloRouter):
             uri = uri.route
 
+        source_path = Path(source)
         component_data = {
             "uri": uri_checker(uri),
             "component": component,
-            "source_path": Path(source),
+            "source_path": source_path,
             "metadata": metadata,
             "static": static,
         }
 
-        cls._components.append(
-
-            component_data
-        )
+        cls._components[id(component_data)] = component_data
+        cls._components_by_source.setdefault(str(source_path.resolve()), []).append(component_data)
+        cls._components_by_cls[component] = [*cls._components_by_cls.get(component, ()), component_data]
 
         SloDebugHandler.add_json(base_key="registered_components", sub_key=uri_checker(uri),
                                  add_item=component_data)  # add the registered_component to the handler
 
         cls.only_components.append(component)
 
+    @classmethod
+    def remove_source(cls, source: str) -> list[dict[str, Any]]:
+        """
+        This method is used to remove every component that was registered from a source file.
+
+        ### Arguments
+        - source (str): The resolved path of the source file
+
+        ### Returns
+        - list: The removed components
+        """
+        components = cls._components_by_source.pop(source, [])
+        for component_data in components:
+            del cls._components[id(component_data)]
+            # Other registrations of the same class (e.g. from another source) stay available
+            remaining = [registered for registered in cls._components_by_cls.get(component_data["component"], ())
+                         if registered is not component_data]
+            if remaining:
+                cls._components_by_cls[component_data["component"]] = remaining
+            else:
+                cls._components_by_cls.pop(component_data["component"], None)
+        return components
+
     @classmethod
     def dispatch(cls, event: Event | Any) -> None:
         """
@@ -107,7 +133,7 @@ class SlApp:
         ### Returns
         - None
         """
-        for component in cls._components:
+        for component in cls._components.values():
             if component["component"].name() == event.name:
                 try:
                     getattr(component, "on_" + event.type)(event)
@@ -147,7 +173,7 @@ class SlApp:
         if obj:
             thread = QueuedThread(data_queue, metadata, target=obj.render)
         elif route:
-            for component in cls._components:
+            for component in cls._components.values():
                 if component["uri"] == route:
                     thread = QueuedThread(data_queue, metadata, target=component["component"]().render)
                     break
@@ -1,30 +1,30 @@
 # Built-in
 import asyncio
-import json
+import hashlib
 import sys
 import importlib.util
 import importlib.machinery
 import importlib.abc
 import socket
 import urllib.request
-import urllib.error
 
 from pathlib import Path
 from importlib import reload
+from typing import Optional
 
 # Third-Party
 import typer
 from textual.events import Key
 
-from watchfiles import awatch
+from watchfiles import awatch, Change, PythonFilter
 
 # This project
 from slobypy.app import SlApp  # type: ignore
 from slobypy.react.design import Design
 from slobypy.rpc import RPC
 from slobypy._templates import *
-from slobypy.react.component import AppComponent
-from slobypy.react.tools import SloDebugHandler
+from slobypy.react.component import AppComponent, Component as SloComponent
+from slobypy.react.tools import SloDebugHandler, json_loads
 # Rich
 from rich.console import Console
 from rich.panel import Panel
@@ -141,7 +141,7 @@ def generate_delete(path: Path):
 
 
 @app.command()
-def run(config: str = "sloby.config.json", slo_bug: Path = "") -> None:
+def run(config: str = "sloby.config.json", slo_bug: Optional[Path] = None) -> None:
     """
     This function is used to run the websockets.
 
@@ -151,9 +151,8 @@ def run(config: str = "sloby.config.json", slo_bug: Path = "") -> None:
     ### Returns
     - None
     """
-    json_path = Path(slo_bug)
-
-    if slo_bug:  # if slo_bug defined
+    if slo_bug is not None:  # if slo_bug defined
+        json_path = Path(slo_bug)
         SloDebugHandler.set_path(json_path)  # !May be duplicated files if it's not match
 
         if SloDebugHandler.analyse():  # if cls.path already defined
@@ -165,8 +164,7 @@ def run(config: str = "sloby.config.json", slo_bug: Path = "") -> None:
     config_path = Path(config)
 
     # Read config_path with json
-    with open(config_path, "r") as f:
-        config = json.load(f)
+    config = json_loads(config_path.read_bytes())
 
     path = Path(config["main"])  # app.py
     runtime_tasks = config["runtime_tasks"]
@@ -177,20 +175,19 @@ def run(config: str = "sloby.config.json", slo_bug: Path = "") -> None:
             preprocessor = import_file(Path(config["preprocessor"]))
 
     # Modules are used to keep track of ALL imported modules
-    modules = {path.resolve(): import_file(path)}  # execute the app.py (user-provided)
+    modules = {str(path.resolve()): import_file(path)}  # execute the app.py (user-provided)
 
     component_base_path = Path(config["components"])  # the component folder
-    component_paths = [component for component in component_base_path.iterdir() if
-                       component.suffix == ".py"]  # get python files(inside components)
+    component_paths = list(component_base_path.glob("*.py"))  # get python files(inside components)
 
     scss_base_path = Path(config["scss"])
-    scss_paths = [scss_file for scss_file in scss_base_path.iterdir() if scss_file.suffix == ".py"]
+    scss_paths = list(scss_base_path.glob("*.py"))
 
     modules.update(
-        {component.resolve(): import_file(component) for component in component_paths})  # execute components files
+        {str(component.resolve()): import_file(component) for component in component_paths})  # execute components files
 
     modules.update(
-        {scss_path.resolve(): import_file(scss_path) for scss_path in scss_paths})  # execute scss files
+        {str(scss_path.resolve()): import_file(scss_path) for scss_path in scss_paths})  # execute scss files
     # Attempt to run the app
     dash = SloDash(modules, config_path.parent)  # root folder(config parent)
 
@@ -207,15 +204,21 @@ class ModuleFinder(importlib.abc.MetaPathFinder):
 
     def find_spec(self, fullname, path, target=None):
         """Find the module spec for a module."""
-        if not fullname in self.path_map:
+        location = self.path_map.get(fullname)
+        if location is None:
             return None
-        return importlib.util.spec_from_file_location(fullname, self.path_map[fullname])
+        return importlib.util.spec_from_file_location(fullname, location)
 
     def find_module(self, fullname, path):
         """Find the module given the fullname and path, only for backwards compatibility"""
         return None  # No need to implement, backward compatibility only
 
 
+# A single finder for every imported file, so sys.meta_path doesn't grow with each (re)import
+_FINDER = ModuleFinder({})
+sys.meta_path.append(_FINDER)
+
+
 def import_file(path: Path):
     """
     Import a file using importlib.
@@ -229,7 +232,7 @@ def import_file(path: Path):
     try:
         spec = importlib.util.spec_from_file_location(path.stem, path.resolve())
         module = importlib.util.module_from_spec(spec)
-        sys.meta_path.append(ModuleFinder({path.stem: str(path.resolve())}))
+        _FINDER.path_map[path.stem] = str(path.resolve())
         sys.modules[path.stem] = module
         spec.loader.exec_module(module)
         print("execute something!")
@@ -240,16 +243,25 @@ def import_file(path: Path):
 
 
 class SloDash:
+    _external_ip_cache: str | None = None  # Resolved once per process
+
     def __init__(self, modules, path):
         self.rpc: RPC = SlApp.rpc  # Will be `None` until RPC started
         self.modules = modules
+        self._hashes: dict[str, bytes] = {}  # content digest of every watched module, used to skip no-op saves
+        for module_path in modules:
+            self._content_changed(Path(module_path))
 
         self.path = path
+        self._components_root = (path / "components").resolve()
 
         self.watch_callbacks = []
         self.pre_rendered: list = []
 
         self.tasks = [self.watch_root(path)]  # asyncio tasks
+        self._rpc_sem = asyncio.Semaphore(4)  # Bounds the hot reloads that run at the same time
+        self._emit_tasks: set[asyncio.Task] = set()  # Strong references to the running hot reloads
+        # Stays a stock asyncio loop: the RPC re-enters it through nest_asyncio, which can't patch uvloop loops
         self.event_loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.event_loop)
 
@@ -277,6 +289,19 @@ class SloDash:
 
         return []
 
+    def _content_changed(self, path: Path) -> bool:
+        """Used to check if the content of the file differs from the last seen version (and remember it)"""
+        try:
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=8).digest()
+        except OSError:
+            return True
+
+        key = str(path)
+        if self._hashes.get(key) == digest:
+            return False
+        self._hashes[key] = digest
+        return True
+
     def check_pre_rendered(self, component) -> str | None:
         """Used to check if the component is pre-rendered or not"""
         if component["static"] is True:
@@ -289,26 +314,24 @@ class SloDash:
     async def watch_component_added(self, path: Path) -> list | list[str]:
         """Hook that is called when a component file is added"""
         if not AppComponent._components:
-            if (self.path / 'components').resolve() in path.parents:
-                return [(self.check_pre_rendered(component),
-
-                        SloDebugHandler.add_json(base_key="registered_components", sub_key=component["uri"], add_item=component))
-
-                        for component in SlApp._components if
-                        component["source_path"] == path]
-            return []
+            routes = []
+            if self._components_root in path.parents:
+                for component in SlApp._components_by_source.get(str(path), []):
+                    SloDebugHandler.add_json(base_key="registered_components", sub_key=component["uri"], add_item=component)
+                    uri = self.check_pre_rendered(component)
+                    if uri is not None:  # pre-rendered(static) components aren't hot reloaded
+                        routes.append(uri)
+            return routes
 
     # noinspection PyProtectedMember
     async def watch_component_modified(self, path: Path) -> list:
         """Hook that is called when a component file is modified"""
 
         routes = []
-        if (self.path / 'components').resolve() in path.parents:
-            for component in SlApp._components.copy():
-                if str(component["source_path"].resolve()) == str(path.resolve()):
-                    SlApp._components.remove(component)
-                    SloDebugHandler.delete_json(base_key="registered_components", sub_key=component["uri"])
-                    routes.append(component["uri"])
+        if self._components_root in path.parents:
+            for component in SlApp.remove_source(str(path)):
+                SloDebugHandler.delete_json(base_key="registered_components", sub_key=component["uri"])
+                routes.append(component["uri"])
         return routes
 
     # noinspection PyProtectedMember
@@ -337,41 +360,115 @@ class SloDash:
             print("[2]" "-" * 20, AppComponent._components, "-" * 20)
         return routes
 
+    def _collect_changes(self, changes) -> tuple[set[Path], set[Path], set[Path]]:
+        """Used to collapse the raw events of an awatch batch, so every file is only handled once"""
+        added, modified, removed = set(), set(), set()
+        for change, changed_path in changes:
+            changed_path = Path(changed_path)
+            if changed_path.suffix != ".py":  # PythonFilter also lets .pyx and .pyd files through
+                continue
+
+            changed_path = changed_path.resolve()
+            match change:
+                case Change.added:
+                    added.add(changed_path)
+                case Change.modified:
+                    modified.add(changed_path)
+                case Change.deleted:
+                    removed.add(changed_path)
+
+        # Editors that save via rename report the file as deleted and added in the same batch
+        renamed = added & removed
+        added -= renamed
+        removed -= renamed
+        modified = (modified | renamed) - added - removed  # new files are imported, deleted ones dropped
+
+        # Touch-only saves, attribute changes and rewrites with identical content don't need a reload
+        modified = {changed_path for changed_path in modified if self._content_changed(changed_path)}
+        return added, modified, removed
+
+    def _reload_module(self, key: str) -> None:
+        """Used to reload a watched module, dropping its cached submodules (packages only) so they re-execute"""
+        module = self.modules.get(key)
+        if module is None:
+            return
+
+        # Files from import_file are plain top-level modules, a prefix match there would only hit unrelated
+        # packages sharing the file's stem (e.g. a components/html.py evicting html.parser)
+        if module.__spec__ is not None and module.__spec__.submodule_search_locations is not None:
+            prefix = module.__name__ + "."
+            for name in [name for name in sys.modules if name.startswith(prefix)]:
+                del sys.modules[name]
+        self.modules[key] = reload(module)
+
     # noinspection PyProtectedMember
     async def watch_root(self, path):
         """Watch the root folder for changes"""
         console.print(f"[bold italic yellow]Watching {str(path.resolve())} for changes")
-        async for changes in awatch(str(path.resolve())):
-            for change in changes:
-                path = Path(change[1])
-                routes = []
-                if path.suffix == ".py":
-                    if change[0]._value_ == 1:  # Added
-
-                        self.modules.update({path.resolve(): import_file(path)})
-
-                        for callback in self.watch_callbacks:
-                            routes.extend(await callback["added"](path))
-
-                    elif change[0]._value_ == 2:  # Modified
-
-                        for callback in self.watch_callbacks:
-                            routes.extend(await callback["modified"](path))
-
-                        # Reload the module
-                        self.modules[path.resolve()] = reload(self.modules[path.resolve()])
-                    else:
-                        # Deleted
-                        for callback in self.watch_callbacks:
-                            routes.extend(await callback["removed"](path))
-                        del self.modules[path.resolve()]
+        async for changes in awatch(str(path.resolve()), watch_filter=PythonFilter(), debounce=200, step=50):
+            added, modified, removed = self._collect_changes(changes)
+            if not (added or modified or removed):
+                continue
+
+            # Once per batch, so the finders pick up new files and don't serve stale directory listings
+            importlib.invalidate_caches()
+
+            all_routes = set()
+            for changed_path in added:
+                self._content_changed(changed_path)
+                self.modules.update({str(changed_path): import_file(changed_path)})
+
+                for callback in self.watch_callbacks:
+                    all_routes.update(await callback["added"](changed_path) or [])
+
+            for changed_path in modified:
+                for callback in self.watch_callbacks:
+                    all_routes.update(await callback["modified"](changed_path) or [])
+                self._reload_module(str(changed_path))
+
+            for changed_path in removed:
+                for callback in self.watch_callbacks:
+                    all_routes.update(await callback["removed"](changed_path) or [])
+                self.modules.pop(str(changed_path), None)
+                self._hashes.pop(str(changed_path), None)
+
+            SloComponent.clear_render_caches()  # Memoized renders may contain output of the reloaded modules
+
+            for callback in self.watch_callbacks:
+                if callback["changes_done"] is not None:
+                    await callback["changes_done"](added | modified | removed)  # call the reload_all_css once per batch
+
+            if all_routes:  # A single RPC fan-out for the whole batch, without holding up the next one
+                task = asyncio.create_task(self._emit(sorted(all_routes)))
+                self._emit_tasks.add(task)
+                task.add_done_callback(self._emit_done)
+
+    def _emit_done(self, task: asyncio.Task) -> None:
+        """Used to release a finished hot reload task and report its failure, if any"""
+        self._emit_tasks.discard(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        console.print(f"[bold red]Hot reload failed: {task.exception()!r}")
 
-                    for callback in self.watch_callbacks:
-                        if callback["changes_done"] is not None:
-                            await callback["changes_done"](path)  # call the reload_all_css with parameter: path
+    async def _emit(self, routes: list[str]) -> None:
+        """Used to hot reload the routes on the RPC, at most 4 at a time"""
+        async with self._rpc_sem:
+            await self.rpc.hot_reload_routes(routes)
 
+    @classmethod
+    async def get_external_ip(cls) -> str:
+        """Used to get the external ip of the machine, without blocking the event loop"""
+        if cls._external_ip_cache is not None:
+            return cls._external_ip_cache
 
-                    await self.rpc.hot_reload_routes(routes)
+        try:
+            external_ip: str = await asyncio.to_thread(
+                lambda: urllib.request.urlopen('https://v4.ident.me', timeout=2).read().decode('utf8').strip()
+            )
+        except OSError:  # URLError and timeouts
+            external_ip = "Unknown"
+        cls._external_ip_cache = external_ip
+        return external_ip
 
     # noinspection PyMethodMayBeStatic
     async def on_start(self, host, port):
@@ -404,11 +501,7 @@ class SloDash:
         grid.add_column(justify="left")
         grid.add_row("> Local RPC:", f"http://localhost:{port}")
         grid.add_row("> Network RPC:", f"http://{socket.gethostbyname(socket.gethostname())}:{port}")
-        try:
-            external_ip = urllib.request.urlopen('https://v4.ident.me').read().decode('utf8')
-        except urllib.error.URLError:
-            external_ip = "Unknown"
-        grid.add_row("> Network RPC:", f"http://{external_ip}:{port} :warning:")
+        grid.add_row("> Network RPC:", f"http://{await self.get_external_ip()}:{port} :warning:")
 
         console.print(Panel(
             grid,
@@ -417,6 +510,8 @@ class SloDash:
         )
         console.print("Waiting for connection from Sloby...\n", style="yellow")
 
+        SloDebugHandler.schedule_flush()  # Write the components registered before the event loop started
+
 
 class Name(Widget):
     selected_preprocessor_name = reactive("")
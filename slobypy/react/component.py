@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 # Built-in
+import threading
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Generator, Type
+from typing import TYPE_CHECKING, Any, ClassVar, Generator, Type
 
 # This project
 from slobypy.react.scss import SCSS
@@ -24,16 +25,37 @@ __all__: tuple[str, ...] = (
     "AppComponent",
 )
 
+_NOT_CACHEABLE = object()  # Render cache marker for props whose output depends on the instance
+
+
+def _is_static(elements) -> bool:
+    """Used to check that the rendered html only depends on the elements (no listeners or nested components)"""
+    for element in elements:
+        # Listeners are rendered from the hash of (usually bound) methods, which differs per instance and
+        # nested components may come from another, since reloaded module
+        if isinstance(element, Component) or getattr(element, "listeners", None):
+            return False
+        if not _is_static(getattr(element, "content", ())):
+            return False
+    return True
+
 
 class Component(ABC):
     """Base Component"""
+    memoize_render: bool = False  # Opt-in, only for components whose body depends on nothing but their props
+    RENDER_CACHE_SIZE: int = 128  # Rendered props combinations kept per component class
+    _render_cache_lock = threading.Lock()  # Shared, components are rendered from multiple threads
+    _render_cache: ClassVar[dict[tuple, object]]  # Set per class on its first memoized render
+    _render_generation: ClassVar[int] = 0  # Bumped by clear_render_caches, drops renders that overlapped a clear
+
     def __new__(cls, props=None, *args, **kwargs):
         # noinspection PyTypeChecker
         component = super().__new__(cls, *args, **kwargs)
         # noinspection PyProtectedMember
-        for registered_component in app.SlApp._components:
-            if registered_component["component"] == cls:
-                component.meta_data = registered_component["metadata"]
+        # A lookup instead of iterating SlApp._components, which the watcher mutates while render threads run
+        registered_components = app.SlApp._components_by_cls.get(cls)
+        if registered_components:
+            component.meta_data = registered_components[-1]["metadata"]  # the latest registration wins
 
         component.props = {} if props is None else props  # component props
         component.style = SCSS()  # Todo: Maybe remove?
@@ -61,18 +83,72 @@ class Component(ABC):
         """
         pass
 
+    def _render_key(self) -> tuple | None:
+        """
+        Get the key of the component in the render cache, or None if the render can't be cached.
+        """
+        if not self.memoize_render:
+            return None
+        try:
+            key = tuple(sorted(self.props.items()))
+            hash(key)
+        except TypeError:  # unhashable(or not comparable) props
+            return None
+        return key
+
     def render(self) -> str:
         """
         Get the component body with html elements and tags.
         """
-        return ''.join([element.render() for element in self.body()])
+        key = self._render_key()
+        if key is None:
+            return ''.join(element.render() for element in self.body())
+
+        with Component._render_cache_lock:
+            # Per class, so a hot reload (which creates a new class) starts with an empty cache
+            cache = type(self).__dict__.get("_render_cache")
+            if cache is None:
+                cache = {}
+                type(self)._render_cache = cache
+            cached = cache.pop(key, None)
+            if cached is not None:
+                cache[key] = cached  # Move to the end, the least recently used entry is evicted first
+            generation = Component._render_generation
+
+        if isinstance(cached, str):
+            return cached
+
+        elements: list[Any] = list(self.body())
+        rendered = ''.join(element.render() for element in elements)
+        if cached is None:  # First render of these props
+            with Component._render_cache_lock:
+                # Rendered before a clear_render_caches (e.g. a hot reload) finished, so possibly stale
+                if generation != Component._render_generation:
+                    return rendered
+                if len(cache) >= self.RENDER_CACHE_SIZE:
+                    del cache[next(iter(cache))]  # drop the least recently used entry
+                cache[key] = rendered if _is_static(elements) else _NOT_CACHEABLE
+        return rendered
+
+    @classmethod
+    def clear_render_caches(cls) -> None:
+        """
+        Drop the render cache of the component class and all of its subclasses.
+        """
+        with Component._render_cache_lock:
+            Component._render_generation += 1
+            pending = [cls]
+            while pending:
+                component_cls = pending.pop()
+                component_cls.__dict__.get("_render_cache", {}).clear()
+                pending.extend(component_cls.__subclasses__())
 
     # noinspection PyMethodMayBeStatic
     def render_js(self) -> str:
         """
         Get any javascript code that is needed for the component
         """
-        return ''.join([element.render_js() for element in self.body()])
+        return ''.join(element.render_js() for element in self.body())
 
     def __str__(self) -> str:
         return self.name
@@ -100,9 +176,9 @@ class AppComponent(ABC):
     #noinspection PyProtectedMember
     #noinspection PyMethodMayBeStatic
     def _get_as_full_component(self, component):
-        for register_component in app.SlApp._components:  # type: ignore
-            if register_component["component"] == component:
-                return register_component
+        registered_components = app.SlApp._components_by_cls.get(component)  # type: ignore
+        if registered_components:
+            return registered_components[0]
 
     # noinspection PyProtectedMember
     def _find_component(self, element) -> None:
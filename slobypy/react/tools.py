@@ -1,15 +1,28 @@
 """General utilities used throughout the React sub-package"""
 from __future__ import annotations
 # Third-Party
-from urllib.parse import urlparse
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from pathlib import Path
+import asyncio
 import json
+import os
+import re
+import stat
+import tempfile
+import warnings
 # This Project
 from slobypy.errors.react_errors import URIError
 import slobypy.app as application
 from slobypy._templates import SLO_DEBUG_HANDLER
 from slobypy.errors.cli_errors import AlreadyExistsException
+
+try:  # Optional, orjson parses and serializes a lot faster than the built-in json module
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 if TYPE_CHECKING:
     from slobypy.react.component import Component
 
@@ -17,9 +30,29 @@ __all__: tuple[str, ...] = (
     "uri_checker",
     "find_component_in_app",
     "SloDebugHandler",
+    "json_loads",
+    "json_dumps",
 )
 
 
+# A non-empty path (so not just a ?query or #fragment), without a scheme or whitespace
+_URI_RE = re.compile(r"(?![A-Za-z][A-Za-z0-9+.-]*:)[^\s?#]\S*")  # used with fullmatch
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Deserialize json data, using orjson if it's installed"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serialize data to compact json bytes, using orjson if it's installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
 def uri_checker(uri: str = "") -> str | bool:
     """
      ### Arguments
@@ -33,9 +66,7 @@ def uri_checker(uri: str = "") -> str | bool:
     if not uri:
         return ""
 
-    slobypy_result = urlparse(uri)
-
-    if slobypy_result.path and slobypy_result.scheme is not True:
+    if _URI_RE.fullmatch(uri):
         return uri
 
     raise URIError("Not valid uri")
@@ -43,9 +74,10 @@ def uri_checker(uri: str = "") -> str | bool:
 
 # noinspection PyProtectedMember
 def find_component_in_app(instance: "Component") -> bool | dict:
-    for component in application.SlApp._components:
-        if isinstance(instance, component["component"]):
-            return component
+    for cls in type(instance).__mro__:  # most specific registered class first
+        components = application.SlApp._components_by_cls.get(cls)
+        if components:
+            return components[0]  # the first registration, like the former scan over SlApp._components
     return False
 
 
@@ -53,14 +85,29 @@ class SloDebugHandler:
     """Used to handle the handler json file(add,delete, update)"""
 
     path: Path = ""
+    FLUSH_DELAY: float = 0.2  # seconds, changes inside this window are written with a single flush
+
+    _cache: dict | None = None  # in-memory copy of the handler json
+    _exists_cached: bool = False  # set once the handler json is known to exist, so analyse() stats only once
+    _dirty: bool = False
+    _flush_lock: asyncio.Lock | None = None
+    _flush_handle: asyncio.TimerHandle | None = None
+    _flush_task: asyncio.Task | None = None
 
     @classmethod
     def analyse(cls) -> bool:
         """Start the handler json file creating process"""
-        if cls.path:
+        if cls._exists_cached:
             return True
+        if not cls.path:
+            return False
 
-        # cls._create_file(cls.path)
+        if Path(cls.path).exists():
+            cls._exists_cached = True
+            return True
+
+        cls._create_file(cls.path)
+        cls._exists_cached = True
         return False
 
     @classmethod
@@ -71,24 +118,26 @@ class SloDebugHandler:
     @classmethod
     def set_path(cls, path: Path):
         """Used to set the path for the handler json file"""
-        # if not Path(path).exists():
-        #     cls.path = path
-        # else:
-        #     raise AlreadyExistsException(f"{path} is already exists")
+        cls.path = Path(path)
+        cls._exists_cached = False
+        cls._cache = None  # Loaded from the new path on the next access
 
     @classmethod
     def add_json(cls, base_key: str, sub_key: str, add_item: dict) -> None:
-       """
-       This method is used to add a new component to the handler json
-       ### Arguments
-        - base_key: registered_components | app_components
-        - sub_key : component_route
-        - add_item: component_data -> dict (uri, component, source_path, metadata, static)
-       """
-       # json_data = cls._load()
-       #
-       # json_data[base_key][sub_key] = str(add_item)
-       # cls._dump(json_data)
+        """
+        This method is used to add a new component to the handler json
+        ### Arguments
+         - base_key: registered_components | app_components
+         - sub_key : component_route
+         - add_item: component_data -> dict (uri, component, source_path, metadata, static)
+        """
+        if not cls.path:  # Debugging is off
+            return
+
+        json_data = cls._load()
+
+        json_data[base_key][sub_key] = str(add_item)
+        cls.schedule_flush()
 
     @classmethod
     def delete_json(cls, base_key: str, sub_key: str) -> None:
@@ -98,19 +147,80 @@ class SloDebugHandler:
           -  base_key: registered_components | app_components
           -  sub_key : component_route
         """
+        if not cls.path:  # Debugging is off
+            return
+
         json_data = cls._load()
 
-        del json_data[base_key][sub_key]
+        json_data[base_key].pop(sub_key, None)
+
+        cls.schedule_flush()
+
+    @classmethod
+    def schedule_flush(cls) -> None:
+        """Mark the handler json as changed and flush it to disk after FLUSH_DELAY seconds"""
+        cls._dirty = True
+        if cls._flush_handle is not None:  # A flush is already pending in this window
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # Not running yet (e.g. import time), the next scheduled flush picks the changes up
+            return
+
+        cls._flush_handle = loop.call_later(cls.FLUSH_DELAY, cls._start_flush, loop)
+
+    @classmethod
+    def _start_flush(cls, loop: asyncio.AbstractEventLoop) -> None:
+        cls._flush_handle = None
+        cls._flush_task = loop.create_task(cls.flush())  # Keep a reference, so the task isn't garbage collected
+        cls._flush_task.add_done_callback(cls._flush_done)
+
+    @classmethod
+    def _flush_done(cls, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        # The changes stay dirty, so the next scheduled flush writes them again
+        warnings.warn(f"Couldn't write the handler json file {cls.path}: {task.exception()}", RuntimeWarning)
+
+    @classmethod
+    async def flush(cls) -> None:
+        """Write the in-memory handler json to disk if it changed since the last flush"""
+        if cls._flush_lock is None:
+            cls._flush_lock = asyncio.Lock()
 
-        cls._dump(json_data)
+        async with cls._flush_lock:
+            if not cls._dirty or not cls.path:
+                return
+            cls._dump(cls._load())
+            cls._dirty = False  # Only once written, a failed write is retried by the next flush
 
     @classmethod
     def _load(cls):
-        with open(cls.path, "r") as f:
-            data = json.load(f)
-        return data
+        if cls._cache is None:
+            if cls.path and Path(cls.path).exists():
+                cls._cache = json_loads(Path(cls.path).read_bytes())
+            else:
+                cls._cache = json_loads(SLO_DEBUG_HANDLER)
+        return cls._cache
 
     @classmethod
     def _dump(cls, data):
-        with open(cls.path, "w") as f:
-            json.dump(data, f)
+        # Write to a temporary file next to the target and swap it in, so readers never see a partial file
+        path = Path(cls.path)
+        temp_file = tempfile.NamedTemporaryFile("wb", dir=path.parent, suffix=".tmp", delete=False)
+        try:
+            with temp_file:
+                temp_file.write(json_dumps(data))
+            # NamedTemporaryFile is created with 0600, keep the permissions the handler json would have
+            try:
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(temp_file.name, mode)
+            os.replace(temp_file.name, path)
+        except BaseException:
+            Path(temp_file.name).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,60 @@
+"""Tests for the SlApp component registry"""
+from pathlib import Path
+
+import pytest
+
+from slobypy.app import SlApp
+from slobypy.react.component import Component
+from slobypy.react.tools import find_component_in_app
+
+
+class Registered(Component):
+    @property
+    def name(self):
+        return "Registered"
+
+    def body(self):
+        yield from ()
+
+
+class Child(Registered):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Empty SlApp registry for every test"""
+    for name, value in (("_components", {}), ("_components_by_source", {}), ("_components_by_cls", {}),
+                        ("only_components", [])):
+        monkeypatch.setattr(SlApp, name, value)
+
+
+def test_find_component_in_app_uses_mro():
+    SlApp.add("/registered", Registered, "first_source.py", {})
+
+    assert find_component_in_app(Child())["uri"] == "/registered"
+    assert find_component_in_app(object()) is False
+
+
+def test_remove_source_keeps_other_registrations():
+    first_source, second_source = "first_source.py", "second_source.py"
+    SlApp.add("/first", Registered, first_source, {})
+    SlApp.add("/second", Registered, second_source, {})
+    assert find_component_in_app(Registered())["uri"] == "/first"
+
+    removed = SlApp.remove_source(str(Path(first_source).resolve()))
+
+    assert [component["uri"] for component in removed] == ["/first"]
+    assert find_component_in_app(Registered())["uri"] == "/second"
+    assert [component["uri"] for component in SlApp._components.values()] == ["/second"]
+
+    SlApp.remove_source(str(Path(second_source).resolve()))
+    assert find_component_in_app(Registered()) is False
+    assert Registered not in SlApp._components_by_cls
+
+
+def test_component_meta_data_from_latest_registration():
+    SlApp.add("/first", Registered, "first_source.py", {"uri": "/first"})
+    SlApp.add("/second", Registered, "second_source.py", {"uri": "/second"})
+
+    assert Registered().meta_data == {"uri": "/second"}
@@ -0,0 +1,102 @@
+"""Tests for the opt-in Component render memoization"""
+from slobypy.react import P
+from slobypy.react.component import Component
+
+
+class Counted(Component):
+    memoize_render = True
+    body_calls = 0
+
+    @property
+    def name(self):
+        return "Counted"
+
+    def body(self):
+        type(self).body_calls += 1
+        yield P(self.props.get("text", ""))
+
+
+class WithListener(Counted):
+    def on_click(self):
+        pass
+
+    def body(self):
+        type(self).body_calls += 1
+        yield P("x", onClick=self.on_click)
+
+
+class WithChild(Counted):
+    def body(self):
+        type(self).body_calls += 1
+        yield P("parent", Counted(props={"text": "child"}))
+
+
+def test_render_is_memoized_per_props():
+    Counted.clear_render_caches()
+    Counted.body_calls = 0
+
+    assert Counted(props={"text": "a"}).render() == Counted(props={"text": "a"}).render()
+    assert Counted.body_calls == 1
+    assert Counted(props={"text": "b"}).render() != Counted(props={"text": "a"}).render()
+    assert Counted.body_calls == 2
+
+    Component.clear_render_caches()
+    Counted(props={"text": "a"}).render()
+    assert Counted.body_calls == 3
+
+
+def test_render_with_listeners_is_not_memoized():
+    first, second = WithListener(), WithListener()
+
+    # The listener markup comes from the hash of the bound method, so it differs per instance
+    assert first.render() != second.render()
+
+
+def test_render_with_nested_components_is_not_memoized():
+    WithChild.body_calls = 0
+
+    WithChild().render()
+    WithChild().render()
+    assert WithChild.body_calls == 2
+
+
+def test_render_with_unhashable_props_is_not_memoized():
+    Counted.body_calls = 0
+
+    Counted(props={"text": "a", "items": [1, 2]}).render()
+    Counted(props={"text": "a", "items": [1, 2]}).render()
+    assert Counted.body_calls == 2
+
+
+class SmallCache(Counted):
+    RENDER_CACHE_SIZE = 2
+
+
+def test_render_cache_evicts_least_recently_used():
+    SmallCache.body_calls = 0
+
+    SmallCache(props={"text": "a"}).render()
+    SmallCache(props={"text": "b"}).render()
+    SmallCache(props={"text": "a"}).render()  # hit, "b" is now the least recently used
+    SmallCache(props={"text": "c"}).render()
+    assert SmallCache.body_calls == 3
+
+    SmallCache(props={"text": "a"}).render()
+    assert SmallCache.body_calls == 3
+    SmallCache(props={"text": "b"}).render()
+    assert SmallCache.body_calls == 4
+
+
+class ClearedWhileRendering(Counted):
+    def body(self):
+        type(self).body_calls += 1
+        Component.clear_render_caches()  # e.g. a hot reload batch on the loop thread
+        yield P("x")
+
+
+def test_render_overlapping_a_clear_is_not_cached():
+    ClearedWhileRendering.body_calls = 0
+
+    ClearedWhileRendering().render()
+    ClearedWhileRendering().render()
+    assert ClearedWhileRendering.body_calls == 2
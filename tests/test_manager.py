@@ -0,0 +1,136 @@
+"""Tests for the SloDash file watcher"""
+import asyncio
+import sys
+from pathlib import Path
+
+from watchfiles import Change
+
+import slobypy.manager as manager
+from slobypy.manager import SloDash, import_file
+
+
+class FakeRPC:
+    def __init__(self):
+        self.reloaded: list[list[str]] = []
+
+    async def hot_reload_routes(self, routes):
+        self.reloaded.append(routes)
+
+
+def fake_awatch(steps):
+    """Replaces watchfiles.awatch, every step prepares the files and then yields its batch"""
+
+    async def awatch(*args, **kwargs):
+        for prepare, batch in steps:
+            prepare()
+            yield batch
+
+    return awatch
+
+
+def run_watch_root(monkeypatch, tmp_path: Path, steps) -> tuple[list, FakeRPC, SloDash]:
+    watched = tmp_path / "watched_module.py"
+    watched.write_text("VALUE = 1\n")
+    calls = []
+
+    def recorder(kind):
+        async def callback(path: Path) -> list[str]:
+            calls.append((kind, path.name))
+            return [f"/{path.stem}"]
+
+        return callback
+
+    dash = SloDash({str(watched.resolve()): import_file(watched)}, tmp_path)
+    for task in dash.tasks:  # watch_root is driven by hand below
+        task.close()
+    dash.rpc = FakeRPC()
+    dash.watch_callbacks = [
+        {"added": recorder("added"), "modified": recorder("modified"), "removed": recorder("removed"),
+         "changes_done": None}
+    ]
+    monkeypatch.setattr(manager, "awatch", fake_awatch(steps))
+
+    async def main():
+        await dash.watch_root(tmp_path)
+        await asyncio.gather(*tuple(dash._emit_tasks), return_exceptions=True)
+
+    dash.event_loop.run_until_complete(main())
+    dash.event_loop.close()
+    return calls, dash.rpc, dash
+
+
+def test_watch_root_batches(monkeypatch, tmp_path):
+    watched = str((tmp_path / "watched_module.py").resolve())
+    added = str((tmp_path / "added_module.py").resolve())
+    swap = str((tmp_path / ".watched_module.py.swp").resolve())
+
+    def nothing():
+        pass
+
+    def edit():
+        Path(watched).write_text("VALUE = 2\n")
+
+    def add():
+        Path(added).write_text("VALUE = 3\n")
+
+    def rename_save():
+        Path(watched).write_text("VALUE = 4\n")
+
+    def delete():
+        Path(added).unlink()
+
+    steps = [
+        (nothing, {(Change.modified, watched)}),  # touch, same content
+        (edit, {(Change.modified, watched), (Change.modified, swap)}),
+        (add, {(Change.added, added), (Change.modified, added)}),
+        (rename_save, {(Change.deleted, watched), (Change.added, watched)}),
+        (delete, {(Change.deleted, added)}),
+    ]
+    calls, rpc, dash = run_watch_root(monkeypatch, tmp_path, steps)
+
+    assert calls == [
+        ("modified", "watched_module.py"),
+        ("added", "added_module.py"),
+        ("modified", "watched_module.py"),
+        ("removed", "added_module.py"),
+    ]
+    # One emit per batch that touched routes, the touch-only batch doesn't reach the RPC
+    assert rpc.reloaded == [["/watched_module"], ["/added_module"], ["/watched_module"], ["/added_module"]]
+    assert dash.modules[watched].VALUE == 4
+    assert added not in dash.modules
+
+
+def test_reload_module_keeps_unrelated_submodules(monkeypatch, tmp_path):
+    watched = tmp_path / "stem_collision.py"
+    watched.write_text("VALUE = 1\n")
+    key = str(watched.resolve())
+    unrelated = object()
+    monkeypatch.setitem(sys.modules, "stem_collision.parser", unrelated)
+
+    dash = SloDash({key: import_file(watched)}, tmp_path)
+    for task in dash.tasks:
+        task.close()
+    dash.event_loop.close()
+    watched.write_text("VALUE = 2\n")
+    dash._reload_module(key)
+
+    assert dash.modules[key].VALUE == 2
+    assert sys.modules["stem_collision.parser"] is unrelated
+
+
+def test_watch_root_reports_failed_hot_reload(monkeypatch, tmp_path):
+    watched = str((tmp_path / "watched_module.py").resolve())
+    printed = []
+
+    async def failing_hot_reload(self, routes):
+        raise ConnectionError("client went away")
+
+    def edit():
+        Path(watched).write_text("VALUE = 2\n")
+
+    monkeypatch.setattr(FakeRPC, "hot_reload_routes", failing_hot_reload)
+    monkeypatch.setattr(manager.console, "print", lambda *args, **kwargs: printed.append(" ".join(map(str, args))))
+    _, _, dash = run_watch_root(monkeypatch, tmp_path, [(edit, {(Change.modified, watched)})])
+
+    assert any("Hot reload failed" in line and "client went away" in line for line in printed)
+    assert not dash._emit_tasks
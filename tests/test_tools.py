@@ -0,0 +1,122 @@
+"""Tests for the React sub-package utilities"""
+import asyncio
+import json
+
+import pytest
+
+from slobypy.errors.react_errors import URIError
+from slobypy.react.tools import SloDebugHandler, uri_checker
+
+
+@pytest.mark.parametrize("uri, valid", [
+    ("", True),
+    ("/route1", True),
+    ("firstcomponent/test", True),
+    ("/user/:id", True),
+    ("/route#section", True),
+    ("/route?tab=1", True),
+    ("http://host/path", False),
+    ("scheme://host/path", False),
+    ("mailto:someone", False),
+    ("/with space", False),
+    ("/tab\there", False),
+    ("/route\n", False),
+    ("#fragment", False),
+    ("?query=1", False),
+])
+def test_uri_checker(uri, valid):
+    if valid:
+        assert uri_checker(uri) == uri
+    else:
+        with pytest.raises(URIError):
+            uri_checker(uri)
+
+
+def run_in_loop(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def handler(monkeypatch, tmp_path):
+    """SloDebugHandler with a fresh class state, pointed at a handler json inside tmp_path"""
+    for name, value in (("path", ""), ("_cache", None), ("_exists_cached", False), ("_dirty", False),
+                        ("_flush_lock", None), ("_flush_handle", None), ("_flush_task", None)):
+        monkeypatch.setattr(SloDebugHandler, name, value)
+    monkeypatch.setattr(SloDebugHandler, "FLUSH_DELAY", 0.01)
+    SloDebugHandler.set_path(tmp_path / "handler.json")
+    return SloDebugHandler
+
+
+def test_debug_handler_disabled(monkeypatch, handler):
+    monkeypatch.setattr(handler, "path", "")
+    handler.add_json(base_key="registered_components", sub_key="/route", add_item={})
+    assert handler._cache is None  # no work at all without a handler path
+    assert handler.analyse() is False
+
+
+def test_debug_handler_flush(handler):
+    async def main():
+        handler.add_json(base_key="registered_components", sub_key="/a", add_item={})
+        handler.add_json(base_key="registered_components", sub_key="/b", add_item={})
+        handler.delete_json(base_key="registered_components", sub_key="/a")
+        assert not handler.path.exists()  # nothing is written inside the flush window
+        await asyncio.sleep(0.05)
+
+    run_in_loop(main())
+    assert json.loads(handler.path.read_text()) == {"registered_components": {"/b": "{}"}, "app_components": {}}
+    assert handler._dirty is False
+
+
+def test_debug_handler_failed_flush_stays_dirty(monkeypatch, handler):
+    def fail(data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(handler, "_dump", fail)
+
+    async def main():
+        handler.add_json(base_key="registered_components", sub_key="/a", add_item={})
+        await asyncio.sleep(0.05)
+
+    with pytest.warns(RuntimeWarning, match="disk full"):
+        run_in_loop(main())
+    assert handler._dirty is True
+
+
+def test_debug_handler_analyse(monkeypatch, handler, tmp_path):
+    assert handler.analyse() is False  # created from the template
+    assert json.loads(handler.path.read_text()) == {"registered_components": {}, "app_components": {}}
+
+    def no_stat(self):
+        raise AssertionError("analyse() shouldn't stat once the file is known to exist")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(type(handler.path), "exists", no_stat)
+        assert handler.analyse() is True
+
+    handler.set_path(tmp_path / "other.json")
+    assert handler.analyse() is False
+    assert handler.analyse() is True
+
+
+def test_debug_handler_dump_keeps_permissions(handler):
+    handler.analyse()
+    handler.path.chmod(0o644)
+
+    handler._dump({"registered_components": {}, "app_components": {}})
+
+    assert handler.path.stat().st_mode & 0o777 == 0o644
+
+
+def test_debug_handler_failed_dump_leaves_no_temp_file(monkeypatch, handler):
+    def fail(data):
+        raise TypeError("not serializable")
+
+    monkeypatch.setattr("slobypy.react.tools.json_dumps", fail)
+
+    with pytest.raises(TypeError):
+        handler._dump({})
+    assert list(handler.path.parent.iterdir()) == []